@@ -7,6 +7,7 @@ API接口模块
 
 import json
 import time
+import base64
 import re
 import os
 import sys
@@ -295,9 +296,6 @@ class ClipboardAPI:
                 
         except Exception as e:
             
-            import traceback
-            
-            
             return json.dumps({
                 'success': False,
                 'message': f'删除操作异常: {type(e).__name__}: {str(e)}'
@@ -488,9 +486,6 @@ class ClipboardAPI:
             str: JSON格式的结果，包含图片的Base64数据
         """
         try:
-            import os
-            import base64
-            
             image_path = os.path.join(self.clipboard_manager.images_dir, filename)
             
             if os.path.exists(image_path):
@@ -8,14 +8,62 @@
 import win32clipboard
 import win32con
 import os
+import re
 import json
+import stat
+import time
 import hashlib
+import threading
+import traceback
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from PIL import Image
 import io
 import uuid
 
+# 需要移除的C0控制字符（保留制表符、换行符、回车符）及DEL
+# 这些字节在UTF-8中不会出现在多字节序列内, 可以直接在bytes上删除
+_CTRL_BYTES = bytes(c for c in range(32) if c not in (9, 10, 13)) + b'\x7f'
+# 复制到剪贴板时额外保留垂直制表符(\x0b)和换页符(\x0c)
+_CTRL_BYTES_KEEP_VT_FF = bytes(c for c in range(32) if c not in (9, 10, 11, 12, 13)) + b'\x7f'
+# C1控制字符在UTF-8中编码为\xc2\x80-\xc2\x9f, 无法按单字节删除
+_C1_CTRL_PATTERN = re.compile(r'[\x80-\x9f]')
+
+
+def _sanitize_text(content, delete_bytes: bytes = _CTRL_BYTES, strip_c1: bool = True) -> str:
+    """
+    清理文本中可能导致编码问题的字符
+    
+    先替换特殊的Unicode分隔符, 再将文本编码为UTF-8后用bytes.translate
+    一次性删除控制字符, 避免正则逐字符匹配
+    
+    Args:
+        content: 文本内容
+        delete_bytes: 需要删除的单字节控制字符
+        strip_c1: 是否同时移除C1控制字符(\x80-\x9f)
+        
+    Returns:
+        str: 清理后的文本
+    """
+    # 确保文本是有效的Unicode字符串
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    
+    # 替换一些特殊的Unicode字符为标准字符（多数文本不包含, 先快速检查）
+    if '\u2028' in content or '\u2029' in content or '\u00a0' in content:
+        content = content.replace('\u2028', '\n')  # 行分隔符
+        content = content.replace('\u2029', '\n\n')  # 段落分隔符
+        content = content.replace('\u00a0', ' ')  # 不间断空格
+    
+    # 在UTF-8字节上删除控制字符（surrogatepass保证孤立代理字符可往返）
+    data = content.encode('utf-8', errors='surrogatepass').translate(None, delete_bytes)
+    
+    # 只有存在\xc2前导字节时才可能包含C1控制字符
+    if strip_c1 and b'\xc2' in data:
+        return _C1_CTRL_PATTERN.sub('', data.decode('utf-8', errors='surrogatepass'))
+    return data.decode('utf-8', errors='surrogatepass')
+
+
 class ClipboardItem:
     """
     剪贴板项目类
@@ -39,6 +87,14 @@ class ClipboardItem:
         self.note = note  # 添加备注字段
         self.hash = self._generate_hash()
         
+    def __setattr__(self, name: str, value: Any):
+        """
+        设置属性, 任何字段变化都会使缓存的JSON失效
+        """
+        if name != '_json_cache':
+            object.__setattr__(self, '_json_cache', None)
+        object.__setattr__(self, name, value)
+        
     def _generate_hash(self) -> str:
         """
         生成内容哈希值, 用于去重
@@ -66,6 +122,17 @@ class ClipboardItem:
             'note': self.note  # 添加备注字段到字典
         }
         
+    def to_json(self) -> str:
+        """
+        获取序列化后的JSON文本, 未变化的项目直接复用缓存
+        
+        Returns:
+            str: JSON格式的数据
+        """
+        if self._json_cache is None:
+            self._json_cache = json.dumps(self.to_dict(), ensure_ascii=False)
+        return self._json_cache
+        
     def _get_preview(self) -> str:
         """
         获取预览文本
@@ -100,9 +167,11 @@ class ClipboardManager:
         self.max_items = max_items
         self.items: List[ClipboardItem] = []
         self.last_clipboard_hash = ""
+        self.last_clipboard_sequence = 0  # 上次检查时的剪贴板序列号
+        self._save_lock = threading.Lock()  # 监听线程、前端API线程和自动删除线程都会保存数据, 需串行写入
+        self.revision = 0  # 数据版本号, 新增项目和每次保存时递增, 供界面判断列表是否需要刷新
         
         # 使用AppData目录存储数据和图片
-        import os
         self.data_dir = os.path.join(os.environ['APPDATA'], 'Copee')  # 保存数据目录引用
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
@@ -131,6 +200,7 @@ class ClipboardManager:
         """
         初始化剪贴板状态, 获取当前剪贴板内容的hash但不保存
         """
+        self.last_clipboard_sequence = win32clipboard.GetClipboardSequenceNumber()
         try:
             win32clipboard.OpenClipboard()
             
@@ -187,10 +257,30 @@ class ClipboardManager:
         """
         保存数据到文件
         """
+        # 修改后都会保存, 在此递增版本号; 新增项目时插入后立即递增, 不依赖保存是否成功
+        self.revision += 1
         try:
-            data = [item.to_dict() for item in self.items]
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 多个线程共用同一个临时文件, 加锁避免交错写入后原子替换出损坏的数据文件
+            with self._save_lock:
+                # 只有新增或修改过的项目需要重新序列化, 其余复用缓存后拼接
+                payload = '[\n' + ',\n'.join(item.to_json() for item in list(self.items)) + '\n]'
+                
+                # 先写入临时文件再原子替换, 避免写入中断导致数据文件损坏
+                temp_file = self.data_file + '.tmp'
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                
+                # 数据文件被其他程序（如杀毒软件、同步盘）短暂占用时替换会失败, 稍后重试
+                max_retries = 3
+                for retry in range(max_retries):
+                    try:
+                        os.replace(temp_file, self.data_file)
+                        break
+                    except PermissionError:
+                        if retry < max_retries - 1:
+                            time.sleep(0.1)  # 等待100ms后重试
+                        else:
+                            raise
         except Exception as e:
             pass  # 静默处理数据保存错误
             
@@ -201,9 +291,17 @@ class ClipboardManager:
         Returns:
             bool: 是否有变化
         """
+        # 序列号未变化说明内容没有更新, 无需打开剪贴板（打开期间会阻塞其他程序访问）
+        sequence = win32clipboard.GetClipboardSequenceNumber()
+        if sequence == self.last_clipboard_sequence:
+            return False
+        
         try:
             # 打开剪贴板
             win32clipboard.OpenClipboard()
+            # 打开成功后才记录序列号; 剪贴板被其他程序占用时序列号保持不变,
+            # 调用方据此判断打开失败并稍后重试
+            self.last_clipboard_sequence = sequence
             
             # 检查是否有文本内容
             if win32clipboard.IsClipboardFormatAvailable(win32con.CF_UNICODETEXT):
@@ -306,7 +404,6 @@ class ClipboardManager:
         except Exception as e:
             print(f"保存设置失败: {e}")
             print(f"错误类型: {type(e).__name__}")
-            import traceback
             print(f"错误堆栈: {traceback.format_exc()}")
             return False
     
@@ -332,13 +429,10 @@ class ClipboardManager:
         启动定时自动删除检查
         每小时检查一次过期记录
         """
-        import threading
-        
         def timer_check():
             while True:
                 try:
                     # 每小时检查一次（3600秒）
-                    import time
                     time.sleep(3600)
                     
                     # 获取当前设置
@@ -358,6 +452,21 @@ class ClipboardManager:
         timer_thread = threading.Thread(target=timer_check, daemon=True)
         timer_thread.start()
     
+    def _check_time_based_auto_delete(self):
+        """
+        新增项目后检查是否需要按时间自动删除
+        """
+        try:
+            auto_delete_settings = self.get_settings().get('autoDelete', {})
+            
+            # 如果启用了按时间删除，执行检查
+            if (auto_delete_settings.get('enabled', False) and 
+                auto_delete_settings.get('byTime', False)):
+                self._apply_auto_delete_settings(auto_delete_settings)
+        except Exception as e:
+            # 静默处理自动删除错误，不影响新项目的保存
+            pass
+    
     def _apply_auto_delete_settings(self, auto_delete_settings: Dict[str, Any]):
         """
         应用自动删除设置
@@ -448,7 +557,6 @@ class ClipboardManager:
         for file_path in self._failed_deletions:
             try:
                 if os.path.exists(file_path):
-                    import stat
                     os.chmod(file_path, stat.S_IWRITE)
                     os.remove(file_path)
             except Exception:
@@ -467,21 +575,8 @@ class ClipboardManager:
         """
         # 预处理文本内容, 清理可能有问题的字符
         try:
-            # 确保文本是有效的Unicode字符串
-            if isinstance(content, bytes):
-                content = content.decode('utf-8', errors='replace')
-            
-            # 清理可能导致编码问题的字符
-            # 替换一些特殊的Unicode字符为标准字符
-            content = content.replace('\u2028', '\n')  # 行分隔符
-            content = content.replace('\u2029', '\n\n')  # 段落分隔符
-            content = content.replace('\u00a0', ' ')  # 不间断空格
-            
-            # 移除或替换其他可能有问题的控制字符
-            import re
             # 保留常见的控制字符（换行、制表符等）, 移除其他控制字符
-            content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', content)
-            
+            content = _sanitize_text(content)
         except Exception as e:
             pass  # 静默处理文本预处理错误
             # 如果处理失败, 确保至少是字符串类型
@@ -490,6 +585,10 @@ class ClipboardManager:
         # 创建新项目
         new_item = ClipboardItem(content, 'text')
         
+        # 再次复制最前面的项目（如从历史中复制后触发的变化）时无需扫描和保存
+        if self.items and self.items[0].hash == new_item.hash:
+            return
+        
         # 检查是否已存在（去重）
         for existing_item in self.items:
             if existing_item.hash == new_item.hash:
@@ -501,6 +600,7 @@ class ClipboardManager:
                 
         # 添加新项目到最前面
         self.items.insert(0, new_item)
+        self.revision += 1
         
         # 限制最大数量
         if len(self.items) > self.max_items:
@@ -536,6 +636,10 @@ class ClipboardManager:
             img_data = img_buffer.getvalue()
             img_hash = hashlib.md5(img_data).hexdigest()
             
+            # 最前面的项目就是这张图片时无需扫描和保存
+            if self.items and self.items[0].item_type == 'image' and self.items[0].hash == img_hash:
+                return
+            
             # 检查是否已存在相同的图片项目（去重）
             for i, existing_item in enumerate(self.items):
                 if existing_item.item_type == 'image' and existing_item.hash == img_hash:
@@ -564,6 +668,7 @@ class ClipboardManager:
             
             # 添加新项目到列表最前面
             self.items.insert(0, new_item)
+            self.revision += 1
             
             # 限制最大数量, 删除多余项目时也要删除对应的图片文件
             if len(self.items) > self.max_items:
@@ -619,22 +724,10 @@ class ClipboardManager:
                     
                     # 处理可能的编码问题
                     try:
-                        # 确保文本是有效的Unicode字符串
-                        if isinstance(text_content, bytes):
-                            text_content = text_content.decode('utf-8', errors='replace')
-                        
-                        # 清理可能导致编码问题的字符
-                        # 替换一些特殊的Unicode字符为标准字符
-                        text_content = text_content.replace('\u2028', '\n')  # 行分隔符
-                        text_content = text_content.replace('\u2029', '\n\n')  # 段落分隔符
-                        text_content = text_content.replace('\u00a0', ' ')  # 不间断空格
-                        
-                        # 移除或替换其他可能有问题的控制字符
-                        import re
                         # 只移除真正有害的控制字符：NULL、响铃、退格等
                         # 保留制表符(\t)、换行符(\n)、回车符(\r)和大部分其他字符
-                        text_content = re.sub(r'[\x00-\x08\x0e-\x1f\x7f]', '', text_content)
                         # 保留Unicode符号如↵(U+21B5)等，这些对用户是有意义的
+                        text_content = _sanitize_text(text_content, _CTRL_BYTES_KEEP_VT_FF, strip_c1=False)
                         
                     except Exception as encoding_error:
                         # 如果文本处理失败，使用原始内容
@@ -731,18 +824,7 @@ class ClipboardManager:
                 
                 # 处理文本内容, 确保编码正确
                 try:
-                    # 确保文本是有效的Unicode字符串
-                    if isinstance(text_content, bytes):
-                        text_content = text_content.decode('utf-8', errors='replace')
-                    
-                    # 清理可能导致编码问题的字符
-                    text_content = text_content.replace('\u2028', '\n')  # 行分隔符
-                    text_content = text_content.replace('\u2029', '\n\n')  # 段落分隔符
-                    text_content = text_content.replace('\u00a0', ' ')  # 不间断空格
-                    
-                    # 移除或替换其他可能有问题的控制字符
-                    import re
-                    text_content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text_content)
+                    text_content = _sanitize_text(text_content)
                     
                 except Exception as encoding_error:
                     text_content = str(text_content)
@@ -806,9 +888,6 @@ class ClipboardManager:
                     if os.path.exists(image_path):
                         try:
                             # 尝试多次删除, 处理文件被占用的情况
-                            import stat
-                            import time
-                            
                             max_retries = 3
                             for retry in range(max_retries):
                                 try:
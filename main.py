@@ -10,24 +10,221 @@
 """
 
 import webview
+import pystray
+from PIL import Image
 import threading
 import time
-import json
 import os
+import io
+import pathlib
+import ctypes
+from ctypes import wintypes
 
 import win32gui
 import win32con
 import win32api
-import win32process
-import win32clipboard
+import win32event
+import winerror
 import sys
-import pystray
-from PIL import Image, ImageDraw
 
 from clipboard_manager import ClipboardManager
 from api import ClipboardAPI
 
 
+# 默认托盘图标（32x32 RGBA PNG），logo文件缺失时使用
+# 由原先的ImageDraw绘制结果预先渲染得到：白底剪贴板外框、紫色夹子和三条内容线
+DEFAULT_TRAY_ICON_PNG = (
+    b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00 \x00\x00\x00 '
+    b'\x08\x06\x00\x00\x00szz\xf4\x00\x00\x00yIDATx\xdacd \x12\xa4'
+    b'\xd5\xbd\xfa\xcf@"\x98\xd5$\xc6HH\r\x13\xc3\x00\x03Fj\xf8\x94\x92\x90\x19'
+    b'\xf0\x10`\xc1%1\xb3Q\x14\x85\x9f^\xff\x9ad\xc3\x891c\xc0C`\xf0F'
+    b'\x01\xa1\xe0\x1c6!0\xf8\xa3\xc0\xc4\xc4\x84bK\xce\x9c9C\xbe\x03\xf0i\x1e'
+    b'M\x03\xa3i`4\r\x0c\xda4@J\xb4\x8d\xa6\x81Q\x07\x8c:`\xd4\x01\xa3'
+    b'\x0e\xc0Y\x12\x92\xd3\x11\x19\x92!0\xe0\x00\x00\x80\xfb!{+e9F\x00\x00'
+    b'\x00\x00IEND\xaeB`\x82'
+)
+
+# 刷新前端剪贴板列表的脚本
+UPDATE_LIST_JS = 'updateClipboardList()'
+
+# 剪贴板内容变化通知消息（AddClipboardFormatListener）
+WM_CLIPBOARDUPDATE = 0x031D
+
+# 单实例互斥体名称，以及通知已运行实例显示窗口的广播消息名称
+SINGLE_INSTANCE_MUTEX = 'Local\\Copee.Singleton'
+SHOW_WINDOW_MESSAGE = 'Copee.Show'
+
+# 全局快捷键 Win+Z（RegisterHotKey）
+HOTKEY_ID = 1
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+HOTKEY_VK = ord('Z')
+
+# 低级鼠标钩子
+WH_MOUSE_LL = 14
+HC_ACTION = 0
+MOUSE_DOWN_MESSAGES = (win32con.WM_LBUTTONDOWN, win32con.WM_RBUTTONDOWN, win32con.WM_MBUTTONDOWN)
+
+# 通知鼠标钩子线程安装/卸载钩子的线程消息（只在窗口可见期间挂钩）
+WM_INSTALL_CLICK_HOOK = win32con.WM_APP + 1
+WM_UNINSTALL_CLICK_HOOK = win32con.WM_APP + 2
+
+# 鼠标钩子检测到外部点击后通知监听窗口隐藏弹窗的消息
+WM_HIDE_POPUP = win32con.WM_APP + 3
+
+# 显示/隐藏弹窗时的SetWindowPos标志，预先组合好；
+# 弹窗尺寸固定，显示时无需发送WM_WINDOWPOSCHANGING让窗口调整位置
+SWP_NOSENDCHANGING = 0x0400
+SHOW_WINDOW_FLAGS = (win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE | win32con.SWP_SHOWWINDOW |
+                     SWP_NOSENDCHANGING)
+HIDE_WINDOW_FLAGS = (win32con.SWP_HIDEWINDOW | win32con.SWP_NOMOVE | win32con.SWP_NOSIZE |
+                     win32con.SWP_NOACTIVATE | win32con.SWP_NOZORDER)
+
+# 延迟刷新前端列表的定时器ID
+LIST_UPDATE_TIMER_ID = 1
+
+# 剪贴板被其他程序占用导致打开失败时的重试定时器
+CLIPBOARD_RETRY_TIMER_ID = 2
+CLIPBOARD_RETRY_DELAY_MS = 50
+CLIPBOARD_RETRY_LIMIT = 5
+
+# GetAncestor标志：获取根窗口
+GA_ROOT = 2
+
+# 前台窗口变化事件钩子
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+
+
+class MSLLHOOKSTRUCT(ctypes.Structure):
+    """
+    低级鼠标钩子事件结构
+    """
+    _fields_ = [
+        ('pt', wintypes.POINT),
+        ('mouseData', wintypes.DWORD),
+        ('flags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+# 线程快照（用于只枚举本进程线程的窗口）
+TH32CS_SNAPTHREAD = 0x00000004
+
+
+class THREADENTRY32(ctypes.Structure):
+    """
+    线程快照条目结构
+    """
+    _fields_ = [
+        ('dwSize', wintypes.DWORD),
+        ('cntUsage', wintypes.DWORD),
+        ('th32ThreadID', wintypes.DWORD),
+        ('th32OwnerProcessID', wintypes.DWORD),
+        ('tpBasePri', wintypes.LONG),
+        ('tpDeltaPri', wintypes.LONG),
+        ('dwFlags', wintypes.DWORD),
+    ]
+
+
+class GUITHREADINFO(ctypes.Structure):
+    """
+    GUI线程信息结构（包含焦点窗口和文本光标位置）
+    """
+    _fields_ = [
+        ('cbSize', wintypes.DWORD),
+        ('flags', wintypes.DWORD),
+        ('hwndActive', wintypes.HWND),
+        ('hwndFocus', wintypes.HWND),
+        ('hwndCapture', wintypes.HWND),
+        ('hwndMenuOwner', wintypes.HWND),
+        ('hwndMoveSize', wintypes.HWND),
+        ('hwndCaret', wintypes.HWND),
+        ('rcCaret', wintypes.RECT),
+    ]
+
+
+LowLevelMouseProc = ctypes.WINFUNCTYPE(wintypes.LPARAM, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+WinEventProc = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+)
+
+# 使用独立的user32实例声明参数类型，避免影响其他模块对ctypes.windll的使用
+user32 = ctypes.WinDLL('user32')
+user32.SetWindowsHookExW.argtypes = (ctypes.c_int, LowLevelMouseProc, wintypes.HINSTANCE, wintypes.DWORD)
+user32.SetWindowsHookExW.restype = wintypes.HHOOK
+user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+user32.CallNextHookEx.restype = wintypes.LPARAM
+user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+user32.GetAncestor.argtypes = (wintypes.HWND, wintypes.UINT)
+user32.GetAncestor.restype = wintypes.HWND
+user32.SetWinEventHook.argtypes = (
+    wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+    wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+)
+user32.SetWinEventHook.restype = wintypes.HANDLE
+user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+user32.UnhookWinEvent.restype = wintypes.BOOL
+user32.GetGUIThreadInfo.argtypes = (wintypes.DWORD, ctypes.POINTER(GUITHREADINFO))
+user32.GetGUIThreadInfo.restype = wintypes.BOOL
+user32.SetTimer.argtypes = (wintypes.HWND, wintypes.WPARAM, wintypes.UINT, ctypes.c_void_p)
+user32.SetTimer.restype = wintypes.WPARAM
+user32.KillTimer.argtypes = (wintypes.HWND, wintypes.WPARAM)
+user32.KillTimer.restype = wintypes.BOOL
+user32.GetClipboardSequenceNumber.argtypes = ()
+user32.GetClipboardSequenceNumber.restype = wintypes.DWORD
+user32.AddClipboardFormatListener.argtypes = (wintypes.HWND,)
+user32.AddClipboardFormatListener.restype = wintypes.BOOL
+user32.RemoveClipboardFormatListener.argtypes = (wintypes.HWND,)
+user32.RemoveClipboardFormatListener.restype = wintypes.BOOL
+user32.RegisterHotKey.argtypes = (wintypes.HWND, ctypes.c_int, wintypes.UINT, wintypes.UINT)
+user32.RegisterHotKey.restype = wintypes.BOOL
+user32.UnregisterHotKey.argtypes = (wintypes.HWND, ctypes.c_int)
+user32.UnregisterHotKey.restype = wintypes.BOOL
+
+kernel32 = ctypes.WinDLL('kernel32')
+kernel32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+kernel32.Thread32First.argtypes = (wintypes.HANDLE, ctypes.POINTER(THREADENTRY32))
+kernel32.Thread32First.restype = wintypes.BOOL
+kernel32.Thread32Next.argtypes = (wintypes.HANDLE, ctypes.POINTER(THREADENTRY32))
+kernel32.Thread32Next.restype = wintypes.BOOL
+kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+kernel32.CloseHandle.restype = wintypes.BOOL
+
+
+def get_process_thread_ids(process_id):
+    """
+    获取指定进程的所有线程ID
+    
+    Args:
+        process_id: 进程ID
+        
+    Returns:
+        list: 线程ID列表
+    """
+    thread_ids = []
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPTHREAD, 0)
+    if not snapshot or snapshot == wintypes.HANDLE(-1).value:
+        return thread_ids
+    
+    try:
+        entry = THREADENTRY32()
+        entry.dwSize = ctypes.sizeof(THREADENTRY32)
+        found = kernel32.Thread32First(snapshot, ctypes.byref(entry))
+        while found:
+            if entry.th32OwnerProcessID == process_id:
+                thread_ids.append(entry.th32ThreadID)
+            found = kernel32.Thread32Next(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+    
+    return thread_ids
+
 
 class ModernClipboardApp:
     """
@@ -35,6 +232,31 @@ class ModernClipboardApp:
     Win+Z快捷键调用模式
     """
     
+    # 显示/隐藏路径上频繁访问的实例属性使用固定槽位，避免字典查找
+    __slots__ = (
+        'clipboard_manager', 'api', 'window', 'is_window_visible', 'window_hwnd', 'webview_hwnd',
+        'tray_icon', 'tray_menu', 'tray_image', 'previous_focus_hwnd',
+        'focus_hook', 'focus_hook_proc', 'mouse_hook', 'mouse_hook_proc', 'mouse_hook_thread_id',
+        'clipboard_listener_hwnd', 'show_window_message', 'clipboard_retry_count',
+        'list_update_pending', 'last_list_update', 'rendered_revision',
+        'screen_width', 'screen_height', 'message_threads', 'hotkey_registered', 'uia_local',
+    )
+    
+    # 窗口尺寸（类似系统剪贴板）
+    WINDOW_WIDTH = 350
+    WINDOW_HEIGHT = 450
+    
+    # 托盘菜单定义：(显示文本, 回调方法名)，None表示分隔线（移除系统剪贴板历史相关选项）
+    TRAY_MENU_ITEMS = (
+        ("显示剪贴板", 'show_window_from_tray'),
+        ("关于", 'show_about'),
+        None,
+        ("退出", 'quit_application'),
+    )
+    
+    # 前端列表刷新的最小间隔（秒），间隔内的多次刷新合并为一次
+    LIST_UPDATE_INTERVAL = 0.05
+    
     def __init__(self):
         """
         初始化应用
@@ -45,12 +267,34 @@ class ModernClipboardApp:
         self.window = None
         self.is_window_visible = False
         self.window_hwnd = None
+        self.webview_hwnd = None  # WebView2控件窗口句柄，随主窗口一起隐藏以便Chromium节流
         self.tray_icon = None
-        self.running = True
-        self.previous_focus_hwnd = None  # 保存之前获得焦点的窗口
+        self.tray_menu = None  # 托盘菜单只构建一次，更新时复用
+        self.tray_image = None  # 托盘图标图片只加载一次，更新时复用
+        self.previous_focus_hwnd = None  # 保存之前获得焦点的窗口（由前台窗口事件持续更新）
+        self.focus_hook = None  # 前台窗口变化事件钩子句柄
+        self.focus_hook_proc = None  # 事件钩子回调，需保持引用防止被回收
+        self.mouse_hook = None  # 低级鼠标钩子句柄
+        self.mouse_hook_proc = None  # 钩子回调，需保持引用防止被回收
+        self.mouse_hook_thread_id = None  # 负责安装/卸载鼠标钩子的线程ID
+        self.clipboard_listener_hwnd = None  # 接收剪贴板变化通知的隐藏窗口
+        self.clipboard_retry_count = 0  # 剪贴板打开失败后已重试的次数（只在监听线程中访问）
+        self.show_window_message = win32gui.RegisterWindowMessage(SHOW_WINDOW_MESSAGE)  # 其他实例启动时广播
+        
+        # 前端列表刷新防抖状态（只在监听线程中访问）
+        self.list_update_pending = False
+        self.last_list_update = 0.0
+        self.rendered_revision = -1  # 前端最近一次刷新时的数据版本号
+        
+        # 缓存屏幕尺寸，显示器设置变化(WM_DISPLAYCHANGE)时刷新
+        self.screen_width = 0
+        self.screen_height = 0
+        self.update_screen_metrics()
+        self.message_threads = []  # 运行消息循环的线程及其线程ID，退出时通知其释放资源
         
         # 快捷键相关
-        self.hotkey_listener = None  # 快捷键监听器
+        self.hotkey_registered = False  # 是否通过RegisterHotKey注册成功
+        self.uia_local = threading.local()  # 按线程缓存的UI Automation客户端（COM对象不能跨套间使用）
         
 
     
@@ -58,73 +302,77 @@ class ModernClipboardApp:
     
 
     
+    def update_screen_metrics(self):
+        """
+        重新读取屏幕尺寸
+        """
+        self.screen_width = win32api.GetSystemMetrics(win32con.SM_CXSCREEN)
+        self.screen_height = win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
+    
     def update_tray_menu(self):
         """
         更新托盘菜单
         """
         if self.tray_icon:
-            # 重新创建菜单（移除系统剪贴板历史相关选项）
-            menu = pystray.Menu(
-                pystray.MenuItem("显示剪贴板", self.show_window_from_tray),
-                pystray.MenuItem("关于", self.show_about),
-                pystray.Menu.SEPARATOR,
-                pystray.MenuItem("退出", self.quit_application)
-            )
-            
             # 更新托盘图标菜单
-            self.tray_icon.menu = menu
+            self.tray_icon.menu = self.build_tray_menu()
+    
+    def build_tray_menu(self):
+        """
+        根据TRAY_MENU_ITEMS构建托盘菜单，构建结果会被缓存
+        
+        Returns:
+            pystray.Menu: 托盘菜单
+        """
+        if self.tray_menu is None:
+            self.tray_menu = pystray.Menu(*(
+                pystray.Menu.SEPARATOR if entry is None
+                else pystray.MenuItem(entry[0], getattr(self, entry[1]))
+                for entry in self.TRAY_MENU_ITEMS
+            ))
+        return self.tray_menu
 
+    def load_tray_image(self):
+        """
+        加载托盘图标图片，只解码一次，之后复用同一个Image实例
+        
+        Returns:
+            PIL.Image.Image: 托盘图标图片
+        """
+        if self.tray_image is not None:
+            return self.tray_image
+        
+        try:
+            # 尝试加载logo.jpg文件
+            logo_path = os.path.join(os.path.dirname(__file__), 'ui', 'logo.jpg')
+            if os.path.exists(logo_path):
+                # 加载并调整logo图片大小
+                image = Image.open(logo_path)
+                # 转换为RGBA模式以支持透明度
+                image = image.convert('RGBA')
+                # 调整大小为32x32像素
+                image = image.resize((32, 32), Image.Resampling.LANCZOS)
+            else:
+                # 如果logo文件不存在，使用默认的剪贴板图标
+                raise FileNotFoundError("Logo file not found")
+        except Exception:
+            # 使用预先渲染的默认剪贴板图标作为备用
+            image = Image.open(io.BytesIO(DEFAULT_TRAY_ICON_PNG))
+            image.load()
+        
+        self.tray_image = image
+        return image
+    
     def create_tray_icon(self):
         """
         创建系统托盘图标
         """
         # 使用自定义logo作为托盘图标
-        def create_icon_image():
-            try:
-                # 尝试加载logo.jpg文件
-                logo_path = os.path.join(os.path.dirname(__file__), 'ui', 'logo.jpg')
-                if os.path.exists(logo_path):
-                    # 加载并调整logo图片大小
-                    image = Image.open(logo_path)
-                    # 转换为RGBA模式以支持透明度
-                    image = image.convert('RGBA')
-                    # 调整大小为32x32像素
-                    image = image.resize((32, 32), Image.Resampling.LANCZOS)
-                    return image
-                else:
-                    # 如果logo文件不存在，使用默认的剪贴板图标
-                    raise FileNotFoundError("Logo file not found")
-            except Exception:
-                # 创建默认的剪贴板图标作为备用
-                image = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-                draw = ImageDraw.Draw(image)
-                
-                # 绘制剪贴板图标
-                # 外框
-                draw.rectangle([4, 2, 28, 30], outline='#667eea', width=2, fill='white')
-                # 夹子
-                draw.rectangle([10, 0, 22, 6], outline='#667eea', width=2, fill='#667eea')
-                # 内容线条
-                draw.line([8, 10, 24, 10], fill='#333', width=1)
-                draw.line([8, 14, 24, 14], fill='#333', width=1)
-                draw.line([8, 18, 20, 18], fill='#333', width=1)
-                
-                return image
-        
-        # 创建托盘菜单（移除系统剪贴板历史相关选项）
-        menu = pystray.Menu(
-            pystray.MenuItem("显示剪贴板", self.show_window_from_tray),
-            pystray.MenuItem("关于", self.show_about),
-            pystray.Menu.SEPARATOR,
-            pystray.MenuItem("退出", self.quit_application)
-        )
-        
-        # 创建托盘图标
         self.tray_icon = pystray.Icon(
             "Copee",
-            create_icon_image(),
+            self.load_tray_image(),
             "win+Z 调用",
-            menu
+            self.build_tray_menu()
         )
         
     def show_window_from_tray(self, icon=None, item=None):
@@ -141,19 +389,9 @@ class ModernClipboardApp:
         """
         def show_about_dialog():
             try:
-                import tkinter as tk
-                from tkinter import messagebox
-                
-                # 创建一个隐藏的根窗口
-                root = tk.Tk()
-                root.withdraw()
-                
-                # 设置窗口属性确保可以正常关闭
-                root.attributes('-topmost', True)
-                root.focus_force()
-                
-                messagebox.showinfo(
-                    "关于Copee",
+                # 直接使用系统消息框，无需创建Tk解释器
+                win32api.MessageBox(
+                    0,
                     "Copee v1.0.0\n\n"
                     "一个现代化的剪贴板管理器\n"
                     "现代化剪贴板管理器\n\n"
@@ -161,13 +399,11 @@ class ModernClipboardApp:
                     "• Win+Z：显示剪贴板历史\n"
                     "• 点击项目：复制到剪贴板\n"
                     "• Escape：隐藏窗口\n\n"
-                    "作者: MTpupil"
+                    "作者: MTpupil",
+                    "关于Copee",
+                    win32con.MB_OK | win32con.MB_ICONINFORMATION |
+                    win32con.MB_TOPMOST | win32con.MB_SETFOREGROUND
                 )
-                
-                # 确保根窗口被正确销毁
-                root.quit()
-                root.destroy()
-                
             except Exception as e:
                 pass  # 静默处理关于对话框错误
         
@@ -179,39 +415,94 @@ class ModernClipboardApp:
         """
         退出应用程序
         """
-        self.running = False
-        
         # 清理所有快捷键
         self.cleanup_hotkeys()
         
-        # 快速退出逻辑
-        try:
-            if self.tray_icon:
-                self.tray_icon.stop()
-        except:
-            pass
+        def stop_ui():
+            """
+            停止托盘并隐藏窗口，两者都需要对应的UI线程配合，可能阻塞
+            """
+            try:
+                if self.tray_icon:
+                    self.tray_icon.stop()
+            except:
+                pass
+            
+            try:
+                if self.window:
+                    self.window.hide()
+            except:
+                pass
         
-        try:
-            if self.window:
-                self.window.hide()
-        except:
-            pass
+        # 快速退出逻辑：UI线程卡在原生调用中时最多等待0.2秒
+        stop_ui_thread = threading.Thread(target=stop_ui, daemon=True)
+        stop_ui_thread.start()
+        stop_ui_thread.join(0.2)
+        
+        # 让消息循环线程自行注销钩子、热键和监听窗口，避免系统钩子链残留
+        self.stop_message_threads()
+        
+        # os._exit不会刷新标准输出缓冲区，退出前手动刷新
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                if stream:
+                    stream.flush()
+            except Exception:
+                pass
         
-        import os
         os._exit(0)
+    
+    def stop_message_threads(self, timeout=0.2):
+        """
+        通知所有消息循环线程退出并等待其释放资源
+        
+        Args:
+            timeout: 每个线程的最长等待时间（秒）
+        """
+        for thread, thread_id in self.message_threads:
+            try:
+                win32api.PostThreadMessage(thread_id, win32con.WM_QUIT, 0, 0)
+            except Exception:
+                pass
+        
+        for thread, thread_id in self.message_threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+    
+    def release_listener_resources(self):
+        """
+        释放剪贴板监听线程持有的系统资源，必须在该线程中调用
+        """
+        try:
+            if self.focus_hook:
+                user32.UnhookWinEvent(self.focus_hook)
+                self.focus_hook = None
+            
+            if self.clipboard_listener_hwnd:
+                if self.hotkey_registered:
+                    user32.UnregisterHotKey(self.clipboard_listener_hwnd, HOTKEY_ID)
+                    self.hotkey_registered = False
+                user32.RemoveClipboardFormatListener(self.clipboard_listener_hwnd)
+                win32gui.DestroyWindow(self.clipboard_listener_hwnd)
+                self.clipboard_listener_hwnd = None
+        except Exception as e:
+            pass  # 静默处理资源释放错误
         
     def create_window(self):
         """
         创建主窗口 - 无边框，类似系统剪贴板窗口，初始隐藏
         """
+        # 界面文件的绝对file:// URI，与程序目录绑定，不受启动时工作目录影响
+        index_uri = pathlib.Path(os.path.dirname(os.path.abspath(__file__)), 'ui', 'index.html').as_uri()
+        
         # 创建webview窗口
         self.window = webview.create_window(
             title='',                 # 无标题
-            url='ui/index.html',      # HTML界面文件
+            url=index_uri,            # HTML界面文件
             js_api=self.api,          # JavaScript API接口
-            width=350,                # 窗口宽度（类似系统剪贴板）
-            height=450,               # 窗口高度
-            min_size=(350, 300),      # 最小尺寸
+            width=self.WINDOW_WIDTH,  # 窗口宽度（类似系统剪贴板）
+            height=self.WINDOW_HEIGHT,  # 窗口高度
+            min_size=(self.WINDOW_WIDTH, 300),  # 最小尺寸
             resizable=False,          # 不可调整大小
             shadow=True,              # 窗口阴影
             on_top=True,              # 置顶显示
@@ -222,33 +513,48 @@ class ModernClipboardApp:
         
 
     
-    def setup_global_hotkey(self):
+    def toggle_window(self):
         """
-        设置全局快捷键 Win+Z
+        切换剪贴板窗口的显示状态
         """
-        def show_clipboard_window():
-            """
-            显示剪贴板窗口的回调函数
-            """
-            if self.is_window_visible:
-                self.hide_window()
-            else:
-                self.show_window()
+        if self.is_window_visible:
+            self.hide_window()
+        else:
+            self.show_window()
+    
+    def setup_global_hotkey(self, hwnd):
+        """
+        设置全局快捷键 Win+Z
+        优先使用RegisterHotKey，由系统只在按下组合键时投递WM_HOTKEY；
+        快捷键已被系统占用时回退到keyboard库
         
+        Args:
+            hwnd: 接收WM_HOTKEY的窗口句柄，必须属于当前线程
+        """
         # 清理之前的快捷键
         self.cleanup_hotkeys()
         
-        # 使用简单的快捷键注册
+        self.hotkey_registered = bool(
+            user32.RegisterHotKey(hwnd, HOTKEY_ID, MOD_WIN | MOD_NOREPEAT, HOTKEY_VK)
+        )
+        if self.hotkey_registered:
+            return
+        
+        # 回退到keyboard库的低级键盘钩子
         try:
             import keyboard
-            keyboard.add_hotkey('win+z', show_clipboard_window)
+            keyboard.add_hotkey('win+z', self.toggle_window)
         except Exception as e:
             pass
     
     def cleanup_hotkeys(self):
         """
-        清理所有快捷键
+        清理keyboard库注册的快捷键
         """
+        # 未使用回退方案时keyboard库不会被导入，无需清理
+        if 'keyboard' not in sys.modules:
+            return
+        
         try:
             import keyboard
             keyboard.clear_all_hotkeys()
@@ -264,9 +570,31 @@ class ModernClipboardApp:
         Returns:
             tuple: (x, y) 坐标
         """
-        import win32api
         return win32api.GetCursorPos()
     
+    def get_uia_client(self):
+        """
+        获取当前线程的UI Automation客户端，首次调用时创建并缓存
+        
+        Returns:
+            tuple: (IUIAutomation对象, UIAutomationClient模块)，不可用时为(None, None)
+        """
+        cache = self.uia_local
+        if not hasattr(cache, 'client'):
+            cache.client = cache.module = None  # 创建失败也记录，避免每次显示窗口都重试
+            try:
+                import comtypes.client
+                from comtypes.gen import UIAutomationClient
+                
+                # 创建UI Automation客户端
+                cache.client = comtypes.client.CreateObject(
+                    "{ff48dba4-60ef-4201-aa87-54103eef594e}", interface=UIAutomationClient.IUIAutomation
+                )
+                cache.module = UIAutomationClient
+            except Exception:
+                pass
+        return cache.client, cache.module
+    
     def get_caret_position(self):
         """
         获取当前输入框光标位置
@@ -277,14 +605,10 @@ class ModernClipboardApp:
         """
         # 方法1: 尝试使用UI Automation获取光标位置
         try:
-            import comtypes.client
-            from comtypes.gen import UIAutomationClient
-            
-            # 创建UI Automation客户端
-            uia = comtypes.client.CreateObject("{ff48dba4-60ef-4201-aa87-54103eef594e}", interface=UIAutomationClient.IUIAutomation)
+            uia, UIAutomationClient = self.get_uia_client()
             
             # 获取当前焦点元素
-            focus_element = uia.GetFocusedElement()
+            focus_element = uia.GetFocusedElement() if uia else None
             if focus_element:
                 # 尝试获取文本模式
                 try:
@@ -314,77 +638,24 @@ class ModernClipboardApp:
         except Exception:
             pass
             
-        # 方法2: 尝试使用传统的GetCaretPos方法（适用于某些应用）
+        # 方法2: 通过GetGUIThreadInfo直接读取前台线程的文本光标和焦点控件，
+        # 无需AttachThreadInput附加线程输入或枚举子窗口
         try:
-            import win32gui
-            import win32api
-            
-            # 获取当前焦点窗口
-            focus_hwnd = win32gui.GetForegroundWindow()
-            if focus_hwnd:
-                # 获取焦点窗口中的线程ID
-                thread_id = win32gui.GetWindowThreadProcessId(focus_hwnd)[1]
-                current_thread_id = win32api.GetCurrentThreadId()
+            gui_info = GUITHREADINFO()
+            gui_info.cbSize = ctypes.sizeof(GUITHREADINFO)
+            # 线程ID为0表示前台线程
+            if user32.GetGUIThreadInfo(0, ctypes.byref(gui_info)):
+                if gui_info.hwndCaret:
+                    # 光标矩形为客户区坐标，转换为屏幕坐标
+                    return win32gui.ClientToScreen(
+                        gui_info.hwndCaret, (gui_info.rcCaret.left, gui_info.rcCaret.top)
+                    )
                 
-                # 附加到焦点窗口的线程
-                attached = False
-                if thread_id != current_thread_id:
-                    try:
-                        win32gui.AttachThreadInput(current_thread_id, thread_id, True)
-                        attached = True
-                    except Exception:
-                        pass
-                
-                try:
-                    # 获取光标信息
-                    caret_info = win32gui.GetCaretPos()
-                    if caret_info and caret_info != (0, 0):
-                        # 将相对坐标转换为屏幕坐标
-                        screen_pos = win32gui.ClientToScreen(focus_hwnd, caret_info)
-                        return screen_pos
-                except Exception:
-                    pass
-                finally:
-                    # 分离线程
-                    if attached:
-                        try:
-                            win32gui.AttachThreadInput(current_thread_id, thread_id, False)
-                        except Exception:
-                            pass
-                            
-        except Exception:
-            pass
-            
-        # 方法3: 使用IME相关API尝试获取输入法光标位置
-        try:
-            import win32gui
-            import win32api
-            
-            focus_hwnd = win32gui.GetForegroundWindow()
-            if focus_hwnd:
-                # 查找输入法相关的子窗口
-                def enum_child_windows(hwnd, result_list):
-                    def callback(child_hwnd, param):
-                        class_name = win32gui.GetClassName(child_hwnd)
-                        # 查找编辑框类型的窗口
-                        if any(edit_class in class_name.lower() for edit_class in ['edit', 'richedit', 'textbox']):
-                            rect = win32gui.GetWindowRect(child_hwnd)
-                            if rect[2] > rect[0] and rect[3] > rect[1]:  # 确保窗口有有效尺寸
-                                result_list.append((child_hwnd, rect))
-                        return True
-                    
-                    win32gui.EnumChildWindows(hwnd, callback, None)
-                    return result_list
-                
-                edit_windows = []
-                enum_child_windows(focus_hwnd, edit_windows)
-                
-                # 如果找到编辑框，使用其位置作为近似光标位置
-                if edit_windows:
-                    # 选择第一个编辑框
-                    _, rect = edit_windows[0]
-                    # 返回编辑框内部左侧位置作为光标位置
-                    return (rect[0] + 10, rect[1] + 10)
+                # 没有文本光标时，使用焦点控件内部左上角作为近似光标位置
+                if gui_info.hwndFocus:
+                    rect = win32gui.GetWindowRect(gui_info.hwndFocus)
+                    if rect[2] > rect[0] and rect[3] > rect[1]:  # 确保窗口有有效尺寸
+                        return (rect[0] + 10, rect[1] + 10)
                     
         except Exception:
             pass
@@ -407,23 +678,15 @@ class ModernClipboardApp:
             return
             
         try:
-            # 保存当前获得焦点的窗口
-            try:
-                self.previous_focus_hwnd = win32gui.GetForegroundWindow()
-                # 保存之前的焦点窗口
-            except Exception as e:
-                pass  # 静默处理焦点窗口保存错误
-                self.previous_focus_hwnd = None
-            
             # 获取输入框光标位置（如果没有输入框焦点则使用鼠标位置）
             caret_x, caret_y = self.get_caret_position()
-            # 获取屏幕尺寸
-            screen_width = win32api.GetSystemMetrics(win32con.SM_CXSCREEN)
-            screen_height = win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
+            # 使用缓存的屏幕尺寸
+            screen_width = self.screen_width
+            screen_height = self.screen_height
             
             # 计算窗口位置，确保不超出屏幕边界
-            window_width = 350
-            window_height = 450
+            window_width = self.WINDOW_WIDTH
+            window_height = self.WINDOW_HEIGHT
             
             # 以光标为原点，窗口显示在第一象限（右上方）
             # X坐标：光标右侧，留出一点间距
@@ -447,19 +710,21 @@ class ModernClipboardApp:
             x = max(10, x)
             y = max(10, y)
             
-            win32gui.ShowWindow(self.window_hwnd, win32con.SW_SHOWNOACTIVATE)
+            # 窗口可见期间才监听外部点击
+            self.set_click_hook(True)
             
-            win32gui.SetWindowPos(
-                self.window_hwnd, 
-                win32con.HWND_TOPMOST,
-                x, y, 0, 0, 
-                win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE
-            )
+            # 先恢复WebView2控件的可见状态，使其恢复渲染
+            if self.webview_hwnd:
+                win32gui.ShowWindow(self.webview_hwnd, win32con.SW_SHOWNA)
+            
+            # 一次SetWindowPos同时完成显示、定位和置顶，避免两次重绘
+            win32gui.SetWindowPos(self.window_hwnd, win32con.HWND_TOPMOST, x, y, 0, 0, SHOW_WINDOW_FLAGS)
             
             self.is_window_visible = True
             
+            # 每次显示都刷新：前端的相对时间（刚刚/N分钟前）只在重新渲染时更新
             try:
-                self.window.evaluate_js('updateClipboardList()')
+                self.run_update_list_js()
             except Exception as js_error:
                 pass
                 
@@ -472,24 +737,62 @@ class ModernClipboardApp:
         """
         try:
             if self.window_hwnd:
-                win32gui.ShowWindow(self.window_hwnd, win32con.SW_HIDE)
+                win32gui.SetWindowPos(self.window_hwnd, 0, 0, 0, 0, 0, HIDE_WINDOW_FLAGS)
                 self.is_window_visible = False
+                self.set_click_hook(False)
+                
+                # 隐藏外层窗口不会通知WebView2，单独隐藏控件让其IsVisible为False，
+                # Chromium据此节流定时器和动画并释放渲染资源
+                if self.webview_hwnd:
+                    win32gui.ShowWindow(self.webview_hwnd, win32con.SW_HIDE)
                 
                 # 恢复之前获得焦点的窗口
                 if self.previous_focus_hwnd:
                     try:
-                        # 检查之前的窗口是否仍然存在
-                        if win32gui.IsWindow(self.previous_focus_hwnd):
+                        # 已经是前台窗口时（如焦点切换触发的隐藏）无需再次设置，
+                        # 否则检查之前的窗口是否仍然存在
+                        if (win32gui.GetForegroundWindow() != self.previous_focus_hwnd and
+                                win32gui.IsWindow(self.previous_focus_hwnd)):
                             win32gui.SetForegroundWindow(self.previous_focus_hwnd)
                     except Exception as e:
                         pass  # 静默处理焦点恢复错误
-                    finally:
-                        self.previous_focus_hwnd = None
                         
 
         except Exception as e:
             pass  # 静默处理窗口隐藏错误
     
+    def get_native_hwnd(self):
+        """
+        通过pywebview的原生窗口对象获取窗口句柄
+        
+        Returns:
+            int: 窗口句柄，后端不支持时返回None
+        """
+        native = getattr(self.window, 'native', None)
+        if native is None:
+            return None
+        try:
+            # WinForms后端的原生对象是Form，Handle为IntPtr
+            return int(native.Handle.ToInt64())
+        except Exception:
+            return None
+    
+    def get_webview_control_hwnd(self):
+        """
+        获取EdgeChromium后端中WebView2控件的窗口句柄
+        
+        Returns:
+            int: 控件窗口句柄，后端不支持时返回None
+        """
+        native = getattr(self.window, 'native', None)
+        if native is None:
+            return None
+        try:
+            # WinForms的WebView2控件在可见性变化时同步CoreWebView2Controller.IsVisible
+            return int(native.browser.web_view.Handle.ToInt64())
+        except Exception:
+            return None
+    
     def setup_window_events(self):
         """
         设置窗口事件处理
@@ -500,10 +803,7 @@ class ModernClipboardApp:
             """
             # 获取窗口句柄
             try:
-                import time
-                time.sleep(1.0)  # 等待窗口完全加载
-                
-                # 使用更精确的方法查找webview窗口
+                # 备用方法：只枚举本进程各线程的顶级窗口查找webview窗口（后端未提供原生窗口对象时使用）
                 def find_webview_window():
                     webview_hwnd = None
                     
@@ -511,63 +811,210 @@ class ModernClipboardApp:
                         nonlocal webview_hwnd
                         # 检查窗口类名是否包含webview相关信息
                         class_name = win32gui.GetClassName(hwnd)
-                        window_text = win32gui.GetWindowText(hwnd)
                         
-                        # 查找Chrome/Edge WebView窗口或无标题的顶级窗口
+                        # 查找Chrome/Edge WebView窗口（Chrome_WidgetWin_1也包含在内）；
+                        # 类名匹配时不再查询标题，标题只用于判断无标题的顶级窗口
                         if ('Chrome' in class_name or 'WebView' in class_name or 
-                            class_name == 'Chrome_WidgetWin_1' or 
-                            (window_text == '' and win32gui.GetParent(hwnd) == 0)):
-                            # 检查窗口是否属于当前进程
-                            _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
-                            current_pid = win32api.GetCurrentProcessId()
-                            if window_pid == current_pid:
-                                webview_hwnd = hwnd
-                                return False  # 停止枚举
+                            (win32gui.GetWindowText(hwnd) == '' and win32gui.GetParent(hwnd) == 0)):
+                            webview_hwnd = hwnd
+                            return False  # 停止枚举
                         return True
                     
-                    win32gui.EnumWindows(enum_callback, None)
+                    # 只回调本进程的窗口，无需逐个检查桌面上所有窗口的所属进程
+                    for thread_id in get_process_thread_ids(win32api.GetCurrentProcessId()):
+                        try:
+                            win32gui.EnumThreadWindows(thread_id, enum_callback, None)
+                        except Exception:
+                            pass  # 回调返回False停止枚举时pywin32可能抛出异常
+                        if webview_hwnd:
+                            break
                     return webview_hwnd
                 
-                self.window_hwnd = find_webview_window()
+                # 优先直接读取pywebview原生窗口的句柄，无需枚举桌面上的所有窗口
+                self.window_hwnd = self.get_native_hwnd() or find_webview_window()
                 
                 if self.window_hwnd:
-                    ex_style = win32gui.GetWindowLong(self.window_hwnd, win32con.GWL_EXSTYLE)
-                    ex_style |= win32con.WS_EX_TOOLWINDOW
-                    ex_style &= ~win32con.WS_EX_APPWINDOW
-                    ex_style &= ~win32con.WS_EX_TRANSPARENT
-                    ex_style &= ~win32con.WS_EX_LAYERED
-                    win32gui.SetWindowLong(self.window_hwnd, win32con.GWL_EXSTYLE, ex_style)
+                    # 扩展样式读取一次，所有位运算在本地完成；值未变化时跳过写入，
+                    # 避免多余的WM_STYLECHANGING/WM_STYLECHANGED通知
+                    old_ex_style = win32gui.GetWindowLong(self.window_hwnd, win32con.GWL_EXSTYLE)
+                    ex_style = (old_ex_style | win32con.WS_EX_TOOLWINDOW) & ~(
+                        win32con.WS_EX_APPWINDOW | win32con.WS_EX_TRANSPARENT | win32con.WS_EX_LAYERED
+                    )
+                    if ex_style != old_ex_style:
+                        win32gui.SetWindowLong(self.window_hwnd, win32con.GWL_EXSTYLE, ex_style)
                     
-                    style = win32gui.GetWindowLong(self.window_hwnd, win32con.GWL_STYLE)
-                    style |= win32con.WS_VISIBLE
-                    win32gui.SetWindowLong(self.window_hwnd, win32con.GWL_STYLE, style)
-                    
-                    win32gui.ShowWindow(self.window_hwnd, win32con.SW_HIDE)
+                    # 扩展样式需要SWP_FRAMECHANGED才会生效；窗口以隐藏状态创建，
+                    # 同时带上SWP_HIDEWINDOW确保初始状态与is_window_visible一致
+                    win32gui.SetWindowPos(
+                        self.window_hwnd, 0, 0, 0, 0, 0,
+                        win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOZORDER |
+                        win32con.SWP_NOACTIVATE | win32con.SWP_FRAMECHANGED | win32con.SWP_HIDEWINDOW
+                    )
                     self.is_window_visible = False
+                    
+                    # 窗口初始隐藏，WebView2控件同样保持隐藏
+                    self.webview_hwnd = self.get_webview_control_hwnd()
+                    if self.webview_hwnd:
+                        win32gui.ShowWindow(self.webview_hwnd, win32con.SW_HIDE)
             except Exception as e:
                 pass
         
-        # 窗口加载完成后执行
+        # 窗口加载完成后执行（由pywebview的loaded事件触发，无需固定等待）
         if self.window:
-            threading.Timer(1.0, on_window_loaded).start()
+            self.window.events.loaded += on_window_loaded
+    
+    def request_list_update(self):
+        """
+        请求刷新前端剪贴板列表，只在监听线程中调用
+        距上次刷新不足LIST_UPDATE_INTERVAL时由监听窗口的定时器延迟执行，
+        期间的请求合并为一次evaluate_js调用
+        """
+        if self.list_update_pending:
+            return
+        delay = self.last_list_update + self.LIST_UPDATE_INTERVAL - time.monotonic()
+        if delay > 0:
+            self.list_update_pending = True
+            user32.SetTimer(
+                self.clipboard_listener_hwnd, LIST_UPDATE_TIMER_ID, max(1, int(delay * 1000)), None
+            )
+            return
+        self.flush_list_update()
+    
+    def flush_list_update(self):
+        """
+        执行前端剪贴板列表刷新
+        """
+        self.list_update_pending = False
+        self.last_list_update = time.monotonic()
+        
+        try:
+            # 窗口句柄在页面加载完成后才设置，未就绪或不可见时无需刷新；
+            # 数据未变化（如重复内容被去重）时前端列表仍是最新的，省去一次跨进程JS调用
+            if (self.window and self.window_hwnd and self.is_window_visible and
+                    self.rendered_revision != self.clipboard_manager.revision):
+                self.run_update_list_js()
+        except Exception as e:
+            pass
+    
+    def run_update_list_js(self):
+        """
+        通知前端刷新剪贴板列表
+        返回值不需要，优先使用不等待结果的run_js（pywebview 5.0+），旧版本回退到evaluate_js
+        """
+        # 调用前读取版本号，刷新期间发生的修改会在下次通知时再次刷新
+        revision = self.clipboard_manager.revision
+        run_js = getattr(self.window, 'run_js', None)
+        if run_js is not None:
+            run_js(UPDATE_LIST_JS)
+        else:
+            self.window.evaluate_js(UPDATE_LIST_JS)
+        self.rendered_revision = revision
     
     def start_clipboard_monitor(self):
         """
         启动剪贴板监控线程
+        通过AddClipboardFormatListener接收WM_CLIPBOARDUPDATE通知，
+        线程在消息循环中阻塞，剪贴板变化时才被唤醒；
+        同一窗口也接收WM_DISPLAYCHANGE广播以刷新缓存的屏幕尺寸、
+        全局快捷键的WM_HOTKEY消息和列表刷新定时器；
+        鼠标钩子不在此线程，避免处理剪贴板内容（图片编码、写盘）时阻塞全局鼠标输入
         """
+        def on_clipboard_update(hwnd):
+            """
+            剪贴板内容变化时的处理
+            check_clipboard_change内部已处理剪贴板访问异常，只以返回值表示是否有新内容；
+            其他程序（如系统剪贴板历史）同时响应通知占用剪贴板时打开会失败，
+            此时序列号未被记录，由定时器稍后重试，避免这次复制的内容丢失
+            """
+            if self.clipboard_manager.check_clipboard_change():
+                self.request_list_update()
+            elif (self.clipboard_manager.last_clipboard_sequence != user32.GetClipboardSequenceNumber() and
+                    self.clipboard_retry_count < CLIPBOARD_RETRY_LIMIT):
+                self.clipboard_retry_count += 1
+                user32.SetTimer(hwnd, CLIPBOARD_RETRY_TIMER_ID, CLIPBOARD_RETRY_DELAY_MS, None)
+        
+        def wnd_proc(hwnd, msg, wparam, lparam):
+            """
+            监听窗口的窗口过程
+            """
+            if msg == WM_CLIPBOARDUPDATE:
+                # 新的变化通知重新计算重试次数
+                self.clipboard_retry_count = 0
+                user32.KillTimer(hwnd, CLIPBOARD_RETRY_TIMER_ID)
+                on_clipboard_update(hwnd)
+                return 0
+            if msg == win32con.WM_TIMER and wparam == CLIPBOARD_RETRY_TIMER_ID:
+                user32.KillTimer(hwnd, CLIPBOARD_RETRY_TIMER_ID)
+                on_clipboard_update(hwnd)
+                return 0
+            if msg == win32con.WM_HOTKEY and wparam == HOTKEY_ID:
+                self.toggle_window()
+                return 0
+            if msg == self.show_window_message:
+                self.show_window()
+                return 0
+            if msg == win32con.WM_TIMER and wparam == LIST_UPDATE_TIMER_ID:
+                user32.KillTimer(hwnd, LIST_UPDATE_TIMER_ID)
+                self.flush_list_update()
+                return 0
+            if msg == WM_HIDE_POPUP:
+                if self.is_window_visible:
+                    self.hide_window()
+                return 0
+            if msg == win32con.WM_DISPLAYCHANGE:
+                self.update_screen_metrics()
+                return 0
+            return win32gui.DefWindowProc(hwnd, msg, wparam, lparam)
+        
+        def on_foreground_changed(h_hook, event, hwnd, id_object, id_child, thread_id, event_time):
+            """
+            前台窗口变化事件回调，记录其他程序的前台窗口以便隐藏时恢复焦点；
+            弹窗显示期间焦点切到其他程序（如Alt+Tab）时一并隐藏弹窗
+            """
+            if hwnd:
+                self.previous_focus_hwnd = hwnd
+                if self.is_window_visible:
+                    self.hide_window()
+        
         def monitor_thread():
             """
             剪贴板监控线程函数
             """
-            while self.running:
-                try:
-                    if self.clipboard_manager.check_clipboard_change():
-                        if self.window and self.is_window_visible:
-                            self.window.evaluate_js('updateClipboardList()')
-                    time.sleep(0.5)
-                except Exception as e:
-                    pass
-                    time.sleep(1)
+            self.message_threads.append((threading.current_thread(), win32api.GetCurrentThreadId()))
+            try:
+                # 创建隐藏的顶级窗口（仅消息窗口收不到WM_DISPLAYCHANGE等广播消息）
+                wc = win32gui.WNDCLASS()
+                wc.lpfnWndProc = wnd_proc
+                wc.lpszClassName = 'CopeeClipboardListener'
+                wc.hInstance = win32api.GetModuleHandle(None)
+                class_atom = win32gui.RegisterClass(wc)
+                
+                self.clipboard_listener_hwnd = win32gui.CreateWindowEx(
+                    0, class_atom, 'Copee', 0,
+                    0, 0, 0, 0,
+                    0, 0, wc.hInstance, None
+                )
+                
+                # 注册剪贴板格式监听
+                user32.AddClipboardFormatListener(self.clipboard_listener_hwnd)
+                
+                # 设置全局快捷键Win+Z（热键需注册在本线程创建的窗口上）
+                self.setup_global_hotkey(self.clipboard_listener_hwnd)
+                
+                # 持续跟踪前台窗口（跳过本进程窗口），显示窗口时无需再查询
+                self.previous_focus_hwnd = win32gui.GetForegroundWindow()
+                self.focus_hook_proc = WinEventProc(on_foreground_changed)
+                self.focus_hook = user32.SetWinEventHook(
+                    EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, None, self.focus_hook_proc,
+                    0, 0, WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+                )
+                
+                # 阻塞在消息循环中，直到收到WM_QUIT
+                win32gui.PumpMessages()
+            except Exception as e:
+                pass
+            finally:
+                self.release_listener_resources()
         
         # 启动监控线程
         monitor = threading.Thread(target=monitor_thread, daemon=True)
@@ -575,49 +1022,107 @@ class ModernClipboardApp:
     
 
     
+    def set_click_hook(self, enabled):
+        """
+        通知鼠标钩子线程安装或卸载外部点击钩子
+        
+        Args:
+            enabled: True安装，False卸载
+        """
+        if not self.mouse_hook_thread_id:
+            return
+        try:
+            message = WM_INSTALL_CLICK_HOOK if enabled else WM_UNINSTALL_CLICK_HOOK
+            win32api.PostThreadMessage(self.mouse_hook_thread_id, message, 0, 0)
+        except Exception as e:
+            pass  # 静默处理钩子切换错误
+    
+    def install_click_hook(self):
+        """
+        安装低级鼠标钩子，必须在鼠标钩子线程中调用（低级钩子由安装线程的消息循环派发）
+        """
+        if self.mouse_hook or not self.mouse_hook_proc:
+            return
+        self.mouse_hook = user32.SetWindowsHookExW(
+            WH_MOUSE_LL, self.mouse_hook_proc, win32api.GetModuleHandle(None), 0
+        )
+    
+    def uninstall_click_hook(self):
+        """
+        卸载低级鼠标钩子
+        """
+        if self.mouse_hook:
+            user32.UnhookWindowsHookEx(self.mouse_hook)
+            self.mouse_hook = None
+    
     def start_click_monitor(self):
         """
         启动鼠标点击监控，点击窗口外部时隐藏窗口
+        使用WH_MOUSE_LL低级鼠标钩子，只在窗口可见期间安装，
+        隐藏时系统钩子链中没有本程序的钩子，鼠标事件完全不经过Python；
+        钩子线程只处理钩子，回调中不做任何跨线程的同步调用，外部点击时只向监听窗口投递消息，
+        不会因等待其他线程而超时被系统移除
         """
-        def on_click(x, y, button, pressed):
+        def on_click(x, y):
             """
-            鼠标点击事件处理
+            鼠标按下事件处理
             """
-            if pressed and self.is_window_visible and self.window_hwnd:
+            if self.window_hwnd:
                 try:
                     # 获取点击位置的窗口句柄
                     clicked_hwnd = win32gui.WindowFromPoint((x, y))
                     
-                    # 检查点击的窗口是否是我们的窗口或其子窗口
-                    is_our_window = False
-                    current_hwnd = clicked_hwnd
-                    
-                    # 向上遍历窗口层次结构，检查是否属于我们的窗口
-                    while current_hwnd:
-                        if current_hwnd == self.window_hwnd:
-                            is_our_window = True
-                            break
-                        current_hwnd = win32gui.GetParent(current_hwnd)
+                    # 检查点击的窗口是否是我们的窗口或其子窗口（一次调用取得根窗口）
+                    is_our_window = user32.GetAncestor(clicked_hwnd, GA_ROOT) == self.window_hwnd
                     
-                    if not is_our_window:
-                        self.hide_window()
+                    # 隐藏窗口需要等待界面线程处理，交给监听线程执行，钩子回调立即返回
+                    if not is_our_window and self.clipboard_listener_hwnd:
+                        win32gui.PostMessage(self.clipboard_listener_hwnd, WM_HIDE_POPUP, 0, 0)
                         
                 except Exception as e:
                     pass
         
-        # 启动鼠标监听
-        try:
-            from pynput import mouse
-            self.mouse_listener = mouse.Listener(on_click=on_click)
-            self.mouse_listener.daemon = True
-            self.mouse_listener.start()
-            # 鼠标点击监听已启动
-        except ImportError:
-            # 警告: 未安装pynput库，无法监听鼠标点击事件
-            # 请运行: pip install pynput
-            pass
-        except Exception as e:
-            pass  # 静默处理鼠标监听启动错误
+        def low_level_mouse_proc(n_code, w_param, l_param):
+            """
+            低级鼠标钩子回调
+            """
+            if n_code == HC_ACTION and self.is_window_visible and w_param in MOUSE_DOWN_MESSAGES:
+                info = MSLLHOOKSTRUCT.from_address(l_param)
+                on_click(info.pt.x, info.pt.y)
+            return user32.CallNextHookEx(None, n_code, w_param, l_param)
+        
+        def hook_thread():
+            """
+            鼠标钩子线程函数，低级钩子需要安装线程运行消息循环
+            """
+            # 先创建线程消息队列，之后才能接收PostThreadMessage
+            win32gui.PeekMessage(None, 0, 0, win32con.PM_NOREMOVE)
+            self.mouse_hook_thread_id = win32api.GetCurrentThreadId()
+            self.message_threads.append((threading.current_thread(), self.mouse_hook_thread_id))
+            
+            try:
+                while True:
+                    result, msg = win32gui.GetMessage(None, 0, 0)
+                    if result <= 0:
+                        break  # 收到WM_QUIT
+                    
+                    if msg[1] == WM_INSTALL_CLICK_HOOK:
+                        self.install_click_hook()
+                    elif msg[1] == WM_UNINSTALL_CLICK_HOOK:
+                        self.uninstall_click_hook()
+                    else:
+                        win32gui.TranslateMessage(msg)
+                        win32gui.DispatchMessage(msg)
+            except Exception as e:
+                pass  # 静默处理鼠标钩子错误
+            finally:
+                self.uninstall_click_hook()
+        
+        self.mouse_hook_proc = LowLevelMouseProc(low_level_mouse_proc)
+        
+        # 启动鼠标钩子线程
+        hook = threading.Thread(target=hook_thread, daemon=True)
+        hook.start()
         
     def run(self):
         """
@@ -639,18 +1144,23 @@ class ModernClipboardApp:
             # 启动鼠标点击监控
             self.start_click_monitor()
             
-            # 设置全局快捷键Win+Z
-            self.setup_global_hotkey()
-            
             # 启动系统托盘
             tray_thread = threading.Thread(target=self.tray_icon.run, daemon=True)
             tray_thread.start()
             
-            # 短暂等待确保所有组件初始化完成
-            time.sleep(0.5)
-            
             # 启动webview界面
-            webview.start(debug=False)
+            # 显式使用Edge WebView2后端，跳过后端探测；未安装WebView2运行时时提示用户而不是静默退出
+            try:
+                webview.start(debug=False, gui='edgechromium')
+            except Exception as e:
+                win32api.MessageBox(
+                    0,
+                    "无法启动界面：未找到 Microsoft Edge WebView2 运行时。\n\n"
+                    "请从微软官网下载安装 WebView2 Runtime 后重新启动 Copee。",
+                    "Copee",
+                    win32con.MB_OK | win32con.MB_ICONERROR | win32con.MB_TOPMOST
+                )
+                raise
             
         except KeyboardInterrupt:
             self.quit_application()
@@ -662,6 +1172,17 @@ def main():
     """
     主函数
     """
+    # 单实例检查：已有实例运行时通知其显示窗口后退出，避免重复安装钩子和监听
+    # 句柄必须保持到进程结束，否则互斥体被释放后无法检测到已运行的实例，不要删除此变量
+    _mutex = win32event.CreateMutex(None, False, SINGLE_INSTANCE_MUTEX)
+    if win32api.GetLastError() == winerror.ERROR_ALREADY_EXISTS:
+        win32gui.PostMessage(
+            win32con.HWND_BROADCAST,
+            win32gui.RegisterWindowMessage(SHOW_WINDOW_MESSAGE),
+            0, 0
+        )
+        return
+    
     app = ModernClipboardApp()
     app.run()
 